@@ -6,69 +6,377 @@ This application reads building access control system logs and generates various
 """
 
 import csv
+import io
+import mmap
 import os
+import re
+import sys
 import argparse
 from datetime import datetime
 from collections import defaultdict
+from collections.abc import Sequence
+from operator import itemgetter
+
+# Columns needed to build the unit to fob report
+FOB_COLUMNS = ('CardFirstName', 'CardBatch', 'CardNumber')
+
+# Header row of the unit to fob report
+FOB_REPORT_HEADER = ('Unit Number (First Name)', 'Fob IDs (CardBatch-CardNumber)')
+
+# Splits a unit number into alternating text and digit runs for natural sorting
+_DIGIT_RUNS = re.compile(r'(\d+)')
+
+def _natural_sort_key(unit):
+    """
+    Sort key ordering embedded numbers by value, so "unit9" sorts before "unit10".
+    
+    The original string breaks ties between names such as "unit01" and "unit1".
+    """
+    parts = _DIGIT_RUNS.split(unit)
+    parts[1::2] = map(int, parts[1::2])
+    return parts, unit
+
+def _fob_column_indices(header):
+    """
+    Return the positions of FOB_COLUMNS in a CSV header.
+    
+    A column missing from the header gets -1, which points at the empty value
+    _read_fob_records appends to each row, so it reads as '' like a blank field.
+    """
+    return [header.index(name) if name in header else -1 for name in FOB_COLUMNS]
+
+def _read_fob_records(csv_reader, header):
+    """
+    Yield stripped (unit number, card batch, card number) tuples from CSV rows.
+    
+    Unit numbers and card batches repeat across many rows, so they are interned
+    to share storage and speed up dict and set lookups keyed on them.
+    
+    Args:
+        csv_reader: Iterator of parsed CSV rows, positioned after the header.
+        header: List of column names for the rows.
+    """
+    intern = sys.intern
+    i_unit, i_batch, i_number = indices = _fob_column_indices(header)
+    has_missing = -1 in indices
+    num_fields = len(header)
+    padding = [''] * num_fields
+    for row in csv_reader:
+        if len(row) < num_fields:
+            row += padding[len(row):]
+        if has_missing:
+            row.append('')
+        yield (intern(row[i_unit].strip()), intern(row[i_batch].strip()),
+               row[i_number].strip())
+
+def _scan_byte_range(data_file, start, end, header):
+    """
+    Collect the distinct fob records in one byte range of the data file.
+    
+    Runs in a worker process. The range must start at the beginning of a line;
+    it covers every line that starts before end. The file is memory-mapped so
+    lines are sliced straight from the page cache instead of being copied
+    through a read buffer first.
+    
+    Returns:
+        Set of (unit number, card batch, card number) tuples with a unit number.
+    """
+    def lines():
+        with open(data_file, 'rb') as file, \
+                mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            mapped.seek(start)
+            while mapped.tell() < end:
+                line = mapped.readline()
+                if not line:
+                    break
+                yield line.decode('utf-8')
+    
+    return set(filter(itemgetter(0), _read_fob_records(csv.reader(lines()), header)))
+
+class _RowView(Sequence):
+    """Read-only sequence presenting column-wise data as one dict per row."""
+    
+    def __init__(self, columns, num_records):
+        self._columns = columns
+        self._num_records = num_records
+    
+    def __len__(self):
+        return self._num_records
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._num_records))]
+        if index < 0:
+            index += self._num_records
+        if not 0 <= index < self._num_records:
+            raise IndexError("row index out of range")
+        return {name: values[index] for name, values in self._columns.items()}
 
 class BuildingAccessAnalyzer:
-    def __init__(self, data_file):
-        """Initialize the analyzer with the data file path."""
+    def __init__(self, data_file, workers=1, natural_sort=False):
+        """
+        Initialize the analyzer with the data file path.
+        
+        Args:
+            data_file: Path to the CSV data file.
+            workers: Number of processes used to scan the file for reports.
+                Values above 1 split the file into byte ranges scanned in parallel.
+            natural_sort: If True, order units by the numbers in their names
+                ("unit9" before "unit10") instead of plain string order.
+        """
         self.data_file = data_file
-        self.data = []
-        self.load_data()
+        self.workers = max(1, workers)
+        self.natural_sort = natural_sort
+        self._columns = None
+        self._num_records = 0
+        self._unit_fobs = None
+        self._fob_report = None
+    
+    @property
+    def columns(self):
+        """Dict mapping each column name to its list of values, loaded on first access."""
+        if self._columns is None:
+            self._load_columns()
+        return self._columns
+    
+    @property
+    def data(self):
+        """
+        Records as a read-only sequence of dicts keyed by column name.
+        
+        Each dict is built from the loaded columns when its row is accessed,
+        so only the rows actually used are materialized.
+        """
+        return _RowView(self.columns, self.num_records)
+    
+    @property
+    def num_records(self):
+        """Number of data rows in the file, loaded on first access."""
+        if self._columns is None:
+            self._load_columns()
+        return self._num_records
     
     def load_data(self):
-        """Load data from the CSV file."""
+        """
+        Load, or reload, data from the CSV file.
+        
+        The columns are loaded on first access anyway, so this is only needed to
+        pick up changes to the file. It also drops the cached scan and report,
+        so later reports reflect the new contents.
+        """
+        self._unit_fobs = None
+        self._fob_report = None
+        self._load_columns()
+    
+    def _load_columns(self):
+        """
+        Read the CSV file into columns.
+        
+        Records are stored column-wise (column name -> list of values) rather
+        than as one dict per row, which keeps loading cheap for large access logs.
+        Values are stripped of surrounding whitespace here so consumers can use
+        them as-is. Reports stream the file themselves and are not affected.
+        """
+        self._columns = {}
+        self._num_records = 0
         try:
-            with open(self.data_file, 'r') as file:
-                csv_reader = csv.DictReader(file)
+            with open(self.data_file, 'r', encoding='utf-8', newline='') as file:
+                csv_reader = csv.reader(file)
+                header = next(csv_reader, [])
+                columns = [[] for _ in header]
+                num_fields = len(header)
+                padding = [''] * num_fields
+                # Bind each column's append once instead of looking it up per value
+                appenders = [column.append for column in columns]
                 for row in csv_reader:
-                    self.data.append(row)
-            print(f"Successfully loaded {len(self.data)} records from {self.data_file}")
+                    # Skip blank lines, as csv.DictReader does
+                    if not row:
+                        continue
+                    # Pad short rows so every column stays the same length
+                    if len(row) < num_fields:
+                        row += padding[len(row):]
+                    for append, value in zip(appenders, row):
+                        append(value.strip())
+            self._columns = dict(zip(header, columns))
+            self._num_records = len(columns[0]) if columns else 0
+            print(f"Successfully loaded {self._num_records} records from {self.data_file}")
         except Exception as e:
             print(f"Error loading data: {e}")
     
-    def generate_unit_fob_report(self, output_file=None):
+    def _iter_records(self):
         """
-        Generate a report showing which unit numbers (first names) used which fobs.
+        Stream (unit number, card batch, card number) tuples from the data file.
         
-        Args:
-            output_file: Optional file path to save the report. If None, prints to console.
+        Rows are read one at a time and never stored, so reports built on top of
+        this only hold their aggregated state in memory. A zero-byte file is
+        treated as an export with no records.
         """
-        unit_fobs = defaultdict(set)
+        try:
+            if os.path.getsize(self.data_file) == 0:
+                return
+            with open(self.data_file, 'r', encoding='utf-8', newline='') as file:
+                csv_reader = csv.reader(file)
+                header = next(csv_reader, [])
+                yield from _read_fob_records(csv_reader, header)
+        except Exception as e:
+            print(f"Error reading data: {e}")
+    
+    def _split_byte_ranges(self):
+        """
+        Split the data rows of the file into one byte range per worker.
         
-        # Process each record
-        for record in self.data:
-            # Extract unit number (first name) and fob info
-            unit_number = record.get('CardFirstName', '').strip()
-            card_batch = record.get('CardBatch', '').strip()
-            card_number = record.get('CardNumber', '').strip()
-            
-            # Create fob identifier
-            fob_id = f"{card_batch}-{card_number}"
+        Boundaries are moved forward to the next line start, so no row is split
+        between workers. A line start is only a row start if no quoted field
+        spans it, which cannot be told from the bytes around the boundary, so
+        files containing any quote character are not split.
+        
+        Returns:
+            Tuple of (header, list of (start, end) byte offsets). The list is empty
+            when the file has no data rows, and None when the file contains quotes.
+        """
+        file_size = os.path.getsize(self.data_file)
+        if file_size == 0:
+            return [], []
+        
+        with open(self.data_file, 'rb') as file:
+            header_line = file.readline()
+            header = next(csv.reader([header_line.decode('utf-8')]), [])
+            data_start = file.tell()
+            if data_start >= file_size:
+                return header, []
             
-            # Add to the mapping
-            if unit_number:
-                unit_fobs[unit_number].add(fob_id)
+            boundaries = [data_start]
+            step = (file_size - data_start) // self.workers
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                if mapped.find(b'"') != -1:
+                    return header, None
+                for i in range(1, self.workers):
+                    newline = mapped.find(b'\n', max(data_start + i * step, boundaries[-1]))
+                    boundaries.append(file_size if newline == -1 else newline + 1)
+            boundaries.append(file_size)
         
-        # Generate report
-        report_lines = ["Unit Number (First Name),Fob IDs (CardBatch-CardNumber)"]
-        for unit, fobs in sorted(unit_fobs.items()):
-            fobs_str = "; ".join(sorted(fobs))
-            report_lines.append(f"{unit},{fobs_str}")
+        ranges = [(start, end) for start, end in zip(boundaries, boundaries[1:]) if start < end]
+        return header, ranges
+    
+    def _scan_parallel(self):
+        """
+        Collect the distinct fob records using a pool of worker processes.
         
-        report_content = "\n".join(report_lines)
+        Returns:
+            Set of (unit number, card batch, card number) tuples with a unit number,
+            or None if the file cannot be split safely and must be scanned serially.
+        """
+        try:
+            header, ranges = self._split_byte_ranges()
+            if ranges is None:
+                return None
+            # Nothing to scan, so skip starting worker processes
+            if not ranges:
+                return set()
+            # Imported here so serial runs do not pay for loading multiprocessing
+            from multiprocessing import Pool
+            with Pool(self.workers) as pool:
+                results = pool.starmap(
+                    _scan_byte_range,
+                    [(self.data_file, start, end, header) for start, end in ranges]
+                )
+            return set().union(*results)
+        except Exception as e:
+            print(f"Error reading data: {e}")
+            return set()
+    
+    def _scan(self):
+        """
+        Aggregate the data file in a single pass.
+        
+        The result is kept on the instance so every report generated by this
+        analyzer shares one scan of the file.
+        
+        Returns:
+            Dict mapping each unit number to the sorted list of fob IDs it used,
+            with units in report order.
+        """
+        if self._unit_fobs is None:
+            unique_records = self._scan_parallel() if self.workers > 1 else None
+            if unique_records is None:
+                # Drop records without a unit and collapse repeated swipes in C,
+                # so the Python loop below only sees distinct (unit, fob) pairs
+                unique_records = set(filter(itemgetter(0), self._iter_records()))
+            unit_fobs = defaultdict(set)
+            for unit_number, card_batch, card_number in unique_records:
+                unit_fobs[unit_number].add(f"{card_batch}-{card_number}")
+            # Sort units and each unit's fobs once here rather than on every report
+            if self.natural_sort:
+                units = sorted(unit_fobs, key=_natural_sort_key)
+            else:
+                units = sorted(unit_fobs)
+            self._unit_fobs = {unit: sorted(unit_fobs[unit]) for unit in units}
+        return self._unit_fobs
+    
+    def _compute_fob(self):
+        """
+        Build the rows of the unit to fob report.
+        
+        Returns:
+            Iterator of (unit number, "; "-joined fob IDs) tuples in report order.
+        """
+        return ((unit, "; ".join(fobs)) for unit, fobs in self._scan().items())
+    
+    def _format_fob_report(self, rows):
+        """
+        Format unit fob report rows as the CSV report content.
+        
+        Rows go through csv.writer so unit numbers containing commas or quotes
+        are quoted correctly.
+        """
+        output = io.StringIO()
+        writer = csv.writer(output, lineterminator='\n')
+        writer.writerow(FOB_REPORT_HEADER)
+        writer.writerows(rows)
+        
+        return output.getvalue()
+    
+    def unit_fob_map(self):
+        """
+        Return which fobs each unit used, without formatting a report.
+        
+        Returns:
+            Dict mapping each unit number, in report order, to the sorted list
+            of fob IDs (CardBatch-CardNumber) it used.
+        """
+        return {unit: list(fobs) for unit, fobs in self._scan().items()}
+    
+    def unit_fob_report(self):
+        """
+        Return the unit to fob report as CSV text, without saving or printing it.
+        
+        The text is formatted once per analyzer and reused by later calls.
+        """
+        if self._fob_report is None:
+            self._fob_report = self._format_fob_report(self._compute_fob())
+        return self._fob_report
+    
+    def generate_unit_fob_report(self, output_file=None):
+        """
+        Generate a report showing which unit numbers (first names) used which fobs.
+        
+        Args:
+            output_file: Optional file path to save the report. If None, prints to console.
+                The directory containing the file must already exist.
+        
+        Returns:
+            The report as CSV text.
+        """
+        report_content = self.unit_fob_report()
         
         # Output the report
         if output_file:
-            os.makedirs(os.path.dirname(output_file), exist_ok=True)
-            with open(output_file, 'w') as file:
+            with open(output_file, 'w', encoding='utf-8', newline='') as file:
                 file.write(report_content)
             print(f"Report saved to {output_file}")
         else:
             print("\nUnit to Fob Report:")
-            print(report_content)
+            print(report_content, end='')
         
         return report_content
 
@@ -78,6 +386,11 @@ def main():
     parser = argparse.ArgumentParser(description='Building Access Control System Analyzer')
     parser.add_argument('-f', '--file', default="sampleData.csv", 
                         help='Path to the CSV data file (default: sampleData.csv)')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='Number of worker processes used to scan the data file (default: 1). '
+                             'Files containing quoted fields are scanned serially')
+    parser.add_argument('--natural-sort', action='store_true',
+                        help='Sort units by the numbers in their names (unit9 before unit10)')
     args = parser.parse_args()
     
     # File paths
@@ -86,15 +399,17 @@ def main():
     os.makedirs(reports_dir, exist_ok=True)
     
     # Initialize analyzer
-    analyzer = BuildingAccessAnalyzer(data_file)
+    analyzer = BuildingAccessAnalyzer(data_file, workers=args.jobs,
+                                      natural_sort=args.natural_sort)
     
     # Generate unit to fob report
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     output_file = os.path.join(reports_dir, f"unit_fob_report_{timestamp}.csv")
-    analyzer.generate_unit_fob_report(output_file)
+    report_content = analyzer.generate_unit_fob_report(output_file)
     
     # Also print to console
-    analyzer.generate_unit_fob_report()
+    print("\nUnit to Fob Report:")
+    print(report_content, end='')
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -3,90 +3,75 @@
 Tests for the Building Access Control System Analyzer
 """
 
+import io
 import os
 import csv
 import unittest
 import tempfile
+from pathlib import Path
 from building_access_analyzer import BuildingAccessAnalyzer
 
+# Header row shared by all test data files
+CSV_HEADER = b"UnitID,CardFirstName,CardLastName,CardBatch,CardNumber\n"
+
+# Test data with consistent UnitID for each CardFirstName (unit number)
+TEST_CSV_BYTES = (
+    CSV_HEADER +
+    b"A101,unit101,unit101 resident,210,54321\n"
+    b"B102,unit102,unit102 resident,220,65432\n"
+    # Two more records for unit102 with same UnitID but accessing a different door
+    b"B102,unit102,unit102 resident,220,65432\n"
+    b"B102,unit102,unit102 resident,220,65432\n"
+    b"C103,unit103,unit103 resident,230,76543\n"
+    # First fob for unit104
+    b"D104,unit104,unit104 resident,240,87654\n"
+    # Second fob for unit104 (same UnitID but different fob)
+    b"D104,unit104,unit104 resident,250,98765\n"
+)
+
+# Header line of every unit to fob report
+FOB_REPORT_HEADER_LINE = "Unit Number (First Name),Fob IDs (CardBatch-CardNumber)"
+
+# Unit to fob report lines expected for TEST_CSV_BYTES
+EXPECTED_FOB_LINES = (
+    FOB_REPORT_HEADER_LINE,
+    "unit101,210-54321",
+    "unit102,220-65432",
+    "unit103,230-76543",
+    "unit104,240-87654; 250-98765",  # unit104 has two fobs
+)
+
+# Report lines expected when there are no usable records
+EXPECTED_EMPTY_LINES = (FOB_REPORT_HEADER_LINE,)
+
+# Keep temporary test files in RAM-backed tmpfs when the platform has it
+TEMP_BASE_DIR = "/dev/shm" if os.access("/dev/shm", os.W_OK) else None
+
 class TestBuildingAccessAnalyzer(unittest.TestCase):
-    def setUp(self):
-        """Set up test environment with a temporary test data file."""
+    @classmethod
+    def setUpClass(cls):
+        """Create the shared test data file and analyzer once for all tests."""
         # Create a temporary file for test data
-        self.temp_dir = tempfile.TemporaryDirectory()
-        self.test_data_file = os.path.join(self.temp_dir.name, "test_data.csv")
-        
-        # Create test data with consistent UnitID for each CardFirstName (unit number)
-        test_data = [
-            {
-                "UnitID": "A101", 
-                "CardFirstName": "unit101", 
-                "CardLastName": "unit101 resident", 
-                "CardBatch": "210", 
-                "CardNumber": "54321"
-            },
-            {
-                "UnitID": "B102", 
-                "CardFirstName": "unit102", 
-                "CardLastName": "unit102 resident", 
-                "CardBatch": "220", 
-                "CardNumber": "65432"
-            },
-            # Another record for unit102 with same UnitID but accessing a different door
-            {
-                "UnitID": "B102", 
-                "CardFirstName": "unit102", 
-                "CardLastName": "unit102 resident", 
-                "CardBatch": "220", 
-                "CardNumber": "65432"
-            },
-            # Another record for unit102 with same UnitID but accessing a different door
-            {
-                "UnitID": "B102", 
-                "CardFirstName": "unit102", 
-                "CardLastName": "unit102 resident", 
-                "CardBatch": "220", 
-                "CardNumber": "65432"
-            },
-            {
-                "UnitID": "C103", 
-                "CardFirstName": "unit103", 
-                "CardLastName": "unit103 resident", 
-                "CardBatch": "230", 
-                "CardNumber": "76543"
-            },
-            # First fob for unit104
-            {
-                "UnitID": "D104", 
-                "CardFirstName": "unit104", 
-                "CardLastName": "unit104 resident", 
-                "CardBatch": "240", 
-                "CardNumber": "87654"
-            },
-            # Second fob for unit104 (same UnitID but different fob)
-            {
-                "UnitID": "D104", 
-                "CardFirstName": "unit104", 
-                "CardLastName": "unit104 resident", 
-                "CardBatch": "250", 
-                "CardNumber": "98765"
-            }
-        ]
-        
-        # Write test data to CSV file
-        with open(self.test_data_file, 'w', newline='') as file:
-            fieldnames = ["UnitID", "CardFirstName", "CardLastName", "CardBatch", "CardNumber"]
-            writer = csv.DictWriter(file, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(test_data)
+        cls.class_temp_dir = tempfile.TemporaryDirectory(dir=TEMP_BASE_DIR)
+        cls.test_data_file = os.path.join(cls.class_temp_dir.name, "test_data.csv")
+        Path(cls.test_data_file).write_bytes(TEST_CSV_BYTES)
+        
+        # Initialize the analyzer with test data; tests only read from it
+        cls.analyzer = BuildingAccessAnalyzer(cls.test_data_file)
+    
+    @classmethod
+    def tearDownClass(cls):
+        """Clean up the shared test data file."""
+        cls.class_temp_dir.cleanup()
+    
+    def setUp(self):
+        """Set up a per-test directory for custom data files and reports."""
+        self.temp_dir = tempfile.TemporaryDirectory(dir=TEMP_BASE_DIR)
         
         # Create a temporary output directory
         self.output_dir = os.path.join(self.temp_dir.name, "reports")
         os.makedirs(self.output_dir, exist_ok=True)
         self.output_file = os.path.join(self.output_dir, "test_report.csv")
-        
-        # Initialize the analyzer with test data
-        self.analyzer = BuildingAccessAnalyzer(self.test_data_file)
     
     def tearDown(self):
         """Clean up temporary files."""
@@ -94,9 +79,80 @@ class TestBuildingAccessAnalyzer(unittest.TestCase):
     
     def test_load_data(self):
         """Test that data is loaded correctly."""
-        self.assertEqual(len(self.analyzer.data), 7)  # Updated to match new test data count
+        self.assertEqual(self.analyzer.num_records, 7)  # Updated to match new test data count
+        self.assertEqual(self.analyzer.columns["CardFirstName"][0], "unit101")
+        self.assertEqual(self.analyzer.columns["CardFirstName"][1], "unit102")
+    
+    def test_data_row_view(self):
+        """Test that records can be read row-wise as dicts."""
+        self.assertEqual(len(self.analyzer.data), 7)
         self.assertEqual(self.analyzer.data[0]["CardFirstName"], "unit101")
-        self.assertEqual(self.analyzer.data[1]["CardFirstName"], "unit102")
+        self.assertEqual(self.analyzer.data[-1]["CardBatch"], "250")
+        self.assertEqual(self.analyzer.data[1], {
+            "UnitID": "B102",
+            "CardFirstName": "unit102",
+            "CardLastName": "unit102 resident",
+            "CardBatch": "220",
+            "CardNumber": "65432"
+        })
+        self.assertEqual(len(list(self.analyzer.data)), 7)
+        with self.assertRaises(IndexError):
+            self.analyzer.data[7]
+    
+    def test_trailing_blank_lines(self):
+        """Test that blank lines at the end of the file are not loaded as records."""
+        blank_lines_file = os.path.join(self.temp_dir.name, "blank_lines.csv")
+        Path(blank_lines_file).write_bytes(
+            CSV_HEADER +
+            b"A101,unit101,unit101 resident,210,54321\r\n"
+            b"\r\n"
+            b"\r\n"
+        )
+        
+        blank_lines_analyzer = BuildingAccessAnalyzer(blank_lines_file)
+        self.assertEqual(blank_lines_analyzer.num_records, 1)
+        self.assertEqual(len(blank_lines_analyzer.data), 1)
+        self.assertEqual(blank_lines_analyzer.columns["CardFirstName"], ["unit101"])
+    
+    def test_lazy_loading(self):
+        """Test that the data file is only read when the data is first used."""
+        # The file does not exist yet when the analyzer is created
+        lazy_data_file = os.path.join(self.temp_dir.name, "lazy_data.csv")
+        lazy_analyzer = BuildingAccessAnalyzer(lazy_data_file)
+        
+        Path(lazy_data_file).write_bytes(TEST_CSV_BYTES)
+        
+        self.assertEqual(lazy_analyzer.num_records, 7)
+        self.assertEqual(lazy_analyzer.columns["CardFirstName"][0], "unit101")
+    
+    def test_reload_refreshes_report(self):
+        """Test that reloading the data also refreshes the cached report."""
+        reload_data_file = os.path.join(self.temp_dir.name, "reload_data.csv")
+        Path(reload_data_file).write_bytes(TEST_CSV_BYTES)
+        reload_analyzer = BuildingAccessAnalyzer(reload_data_file)
+        self.assertEqual(tuple(reload_analyzer.unit_fob_report().splitlines()), EXPECTED_FOB_LINES)
+        
+        # Replace the file with a header-only export and reload it
+        Path(reload_data_file).write_bytes(CSV_HEADER)
+        reload_analyzer.load_data()
+        
+        self.assertEqual(tuple(reload_analyzer.unit_fob_report().splitlines()), EXPECTED_EMPTY_LINES)
+        self.assertEqual(reload_analyzer.unit_fob_map(), {})
+    
+    def test_lazy_load_keeps_report_cache(self):
+        """Test that loading the columns after a report does not rescan the file."""
+        class CountingAnalyzer(BuildingAccessAnalyzer):
+            scans = 0
+            
+            def _iter_records(self):
+                self.scans += 1
+                return super()._iter_records()
+        
+        counting_analyzer = CountingAnalyzer(self.test_data_file)
+        first_report = counting_analyzer.generate_unit_fob_report(self.output_file)
+        self.assertEqual(counting_analyzer.num_records, 7)
+        self.assertEqual(counting_analyzer.generate_unit_fob_report(self.output_file), first_report)
+        self.assertEqual(counting_analyzer.scans, 1)
     
     def test_generate_unit_fob_report(self):
         """Test that the unit fob report is generated correctly."""
@@ -106,44 +162,18 @@ class TestBuildingAccessAnalyzer(unittest.TestCase):
         # Check that the file was created
         self.assertTrue(os.path.exists(self.output_file))
         
-        # Check the content of the report
-        expected_lines = [
-            "Unit Number (First Name),Fob IDs (CardBatch-CardNumber)",
-            "unit101,210-54321",
-            "unit102,220-65432",
-            "unit103,230-76543",
-            "unit104,240-87654; 250-98765"  # unit104 has two fobs
-        ]
-        
-        # Read the actual content
-        with open(self.output_file, 'r') as file:
-            actual_lines = [line.strip() for line in file.readlines()]
-        
-        # Compare expected vs actual
-        self.assertEqual(len(actual_lines), len(expected_lines))
-        for expected, actual in zip(expected_lines, actual_lines):
-            self.assertEqual(expected, actual)
+        # Compare expected vs actual content of the report
+        self.assertEqual(tuple(Path(self.output_file).read_text().splitlines()), EXPECTED_FOB_LINES)
         
         # Also check the returned content
-        report_lines = report_content.strip().split('\n')
-        self.assertEqual(len(report_lines), len(expected_lines))
-        for expected, actual in zip(expected_lines, report_lines):
-            self.assertEqual(expected, actual)
+        self.assertEqual(tuple(report_content.splitlines()), EXPECTED_FOB_LINES)
     
     def test_multiple_fobs_per_unit(self):
         """Test that the analyzer correctly identifies units with multiple fobs."""
-        # Generate the report
-        report_content = self.analyzer.generate_unit_fob_report(self.output_file)
-        
-        # Parse the report to check for multiple fobs
-        units_with_multiple_fobs = {}
-        
-        # Skip the header line
-        for line in report_content.strip().split('\n')[1:]:
-            unit, fobs_str = line.split(',', 1)
-            fobs = fobs_str.split('; ')
-            if len(fobs) > 1:
-                units_with_multiple_fobs[unit] = fobs
+        # Use the structured mapping rather than parsing the report text
+        units_with_multiple_fobs = {
+            unit: fobs for unit, fobs in self.analyzer.unit_fob_map().items() if len(fobs) > 1
+        }
         
         # Verify that unit104 has multiple fobs
         self.assertIn('unit104', units_with_multiple_fobs)
@@ -158,9 +188,8 @@ class TestBuildingAccessAnalyzer(unittest.TestCase):
         
         # Verify the consistency between UnitID and CardFirstName
         unit_to_unitid = {}
-        for record in self.analyzer.data:
-            unit = record["CardFirstName"]
-            unitid = record["UnitID"]
+        columns = self.analyzer.columns
+        for unit, unitid in zip(columns["CardFirstName"], columns["UnitID"]):
             if unit in unit_to_unitid:
                 # Check that the UnitID is consistent for the same unit
                 self.assertEqual(unit_to_unitid[unit], unitid, 
@@ -172,17 +201,14 @@ class TestBuildingAccessAnalyzer(unittest.TestCase):
         """Test that the analyzer handles empty data gracefully."""
         # Create an empty data file
         empty_data_file = os.path.join(self.temp_dir.name, "empty_data.csv")
-        with open(empty_data_file, 'w', newline='') as file:
-            fieldnames = ["UnitID", "CardFirstName", "CardLastName", "CardBatch", "CardNumber"]
-            writer = csv.DictWriter(file, fieldnames=fieldnames)
-            writer.writeheader()
-            # No rows written - empty data
+        # No rows written - empty data
+        Path(empty_data_file).write_bytes(CSV_HEADER)
         
         # Initialize analyzer with empty data
         empty_analyzer = BuildingAccessAnalyzer(empty_data_file)
         
         # Check that data is empty but initialized
-        self.assertEqual(len(empty_analyzer.data), 0)
+        self.assertEqual(empty_analyzer.num_records, 0)
         
         # Generate report with empty data
         empty_output_file = os.path.join(self.output_dir, "empty_report.csv")
@@ -192,51 +218,37 @@ class TestBuildingAccessAnalyzer(unittest.TestCase):
         self.assertTrue(os.path.exists(empty_output_file))
         
         # Check that the report only contains the header
-        expected_lines = ["Unit Number (First Name),Fob IDs (CardBatch-CardNumber)"]
-        
-        # Read the actual content
-        with open(empty_output_file, 'r') as file:
-            actual_lines = [line.strip() for line in file.readlines()]
-        
-        self.assertEqual(len(actual_lines), len(expected_lines))
-        self.assertEqual(actual_lines[0], expected_lines[0])
+        self.assertEqual(tuple(Path(empty_output_file).read_text().splitlines()), EXPECTED_EMPTY_LINES)
+    
+    def test_zero_byte_file(self):
+        """Test that a completely empty file gives a header-only report."""
+        zero_byte_file = os.path.join(self.temp_dir.name, "zero_byte.csv")
+        Path(zero_byte_file).write_bytes(b"")
+        
+        for workers in (1, 2):
+            zero_byte_analyzer = BuildingAccessAnalyzer(zero_byte_file, workers=workers)
+            report_content = zero_byte_analyzer.unit_fob_report()
+            self.assertEqual(tuple(report_content.splitlines()), EXPECTED_EMPTY_LINES)
     
     def test_malformed_data(self):
         """Test that the analyzer handles malformed data gracefully."""
         # Create a file with malformed data (missing fields)
         malformed_data_file = os.path.join(self.temp_dir.name, "malformed_data.csv")
-        with open(malformed_data_file, 'w', newline='') as file:
-            fieldnames = ["UnitID", "CardFirstName", "CardLastName", "CardBatch", "CardNumber"]
-            writer = csv.DictWriter(file, fieldnames=fieldnames)
-            writer.writeheader()
-            # Write some rows with missing data
-            writer.writerow({
-                "UnitID": "A101", 
-                "CardFirstName": "unit101", 
-                "CardLastName": "unit101 resident", 
-                # Missing CardBatch
-                "CardNumber": "54321"
-            })
-            writer.writerow({
-                "UnitID": "B102", 
-                "CardFirstName": "unit102", 
-                # Missing CardLastName
-                "CardBatch": "220", 
-                "CardNumber": "65432"
-            })
-            writer.writerow({
-                "UnitID": "C103", 
-                # Missing CardFirstName
-                "CardLastName": "unit103 resident", 
-                "CardBatch": "230", 
-                "CardNumber": "76543"
-            })
+        Path(malformed_data_file).write_bytes(
+            CSV_HEADER +
+            # Missing CardBatch
+            b"A101,unit101,unit101 resident,,54321\n"
+            # Missing CardLastName
+            b"B102,unit102,,220,65432\n"
+            # Missing CardFirstName
+            b"C103,,unit103 resident,230,76543\n"
+        )
         
         # Initialize analyzer with malformed data
         malformed_analyzer = BuildingAccessAnalyzer(malformed_data_file)
         
         # Check that data is loaded
-        self.assertEqual(len(malformed_analyzer.data), 3)
+        self.assertEqual(malformed_analyzer.num_records, 3)
         
         # Generate report with malformed data
         malformed_output_file = os.path.join(self.output_dir, "malformed_report.csv")
@@ -247,8 +259,7 @@ class TestBuildingAccessAnalyzer(unittest.TestCase):
         
         # Check the content of the report - should handle missing data gracefully
         # Only unit101 and unit102 should appear (unit103 has no CardFirstName)
-        with open(malformed_output_file, 'r') as file:
-            actual_lines = [line.strip() for line in file.readlines()]
+        actual_lines = Path(malformed_output_file).read_text().splitlines()
         
         # Check that unit101 is in the report with a blank or default fob ID
         unit101_line = None
@@ -268,53 +279,106 @@ class TestBuildingAccessAnalyzer(unittest.TestCase):
         # unit102 should have a normal fob ID
         self.assertIn("220-65432", unit102_line)
     
+    def test_missing_required_column(self):
+        """Test that a missing column is read as empty values."""
+        # Create a file whose header has no CardBatch column
+        missing_column_file = os.path.join(self.temp_dir.name, "missing_column.csv")
+        Path(missing_column_file).write_bytes(
+            b"UnitID,CardFirstName,CardLastName,CardNumber\n"
+            b"A101,unit101,unit101 resident,54321\n"
+        )
+        
+        # Serial and parallel scans both fall back to an empty card batch
+        for workers in (1, 2):
+            with self.subTest(workers=workers):
+                missing_column_analyzer = BuildingAccessAnalyzer(missing_column_file, workers=workers)
+                report_content = missing_column_analyzer.unit_fob_report()
+                self.assertEqual(
+                    tuple(report_content.splitlines()),
+                    (FOB_REPORT_HEADER_LINE, "unit101,-54321")
+                )
+    
     def test_sorting(self):
         """Test that the report is sorted by unit number."""
-        # Generate the report
-        report_content = self.analyzer.generate_unit_fob_report(self.output_file)
+        # Get the report text without saving or printing it
+        report_content = self.analyzer.unit_fob_report()
         
         # Parse the report to get unit numbers
-        unit_numbers = []
-        for line in report_content.strip().split('\n')[1:]:  # Skip header
-            unit, _ = line.split(',', 1)
-            unit_numbers.append(unit)
+        reader = csv.reader(io.StringIO(report_content))
+        next(reader)  # Skip header
+        unit_numbers = [row[0] for row in reader]
         
         # Check that unit numbers are sorted
         sorted_unit_numbers = sorted(unit_numbers)
         self.assertEqual(unit_numbers, sorted_unit_numbers)
     
+    def test_natural_sorting(self):
+        """Test that natural sorting orders units by their numeric suffix."""
+        natural_data_file = os.path.join(self.temp_dir.name, "natural_data.csv")
+        Path(natural_data_file).write_bytes(
+            CSV_HEADER +
+            b"J110,unit10,unit10 resident,210,11111\n"
+            b"I109,unit9,unit9 resident,220,22222\n"
+            b"K200,unit100,unit100 resident,230,33333\n"
+        )
+        
+        # Plain string order keeps the default behavior
+        default_analyzer = BuildingAccessAnalyzer(natural_data_file)
+        self.assertEqual(list(default_analyzer.unit_fob_map()), ["unit10", "unit100", "unit9"])
+        
+        natural_analyzer = BuildingAccessAnalyzer(natural_data_file, natural_sort=True)
+        self.assertEqual(list(natural_analyzer.unit_fob_map()), ["unit9", "unit10", "unit100"])
+        report_content = natural_analyzer.unit_fob_report()
+        self.assertEqual(report_content.splitlines()[1:], [
+            "unit9,220-22222",
+            "unit10,210-11111",
+            "unit100,230-33333",
+        ])
+    
+    def test_parallel_scan(self):
+        """Test that scanning with worker processes gives the same report."""
+        expected_report = self.analyzer.unit_fob_report()
+        
+        # More workers than rows exercises empty and single-line byte ranges
+        for workers in (2, 3, 16):
+            parallel_analyzer = BuildingAccessAnalyzer(self.test_data_file, workers=workers)
+            report_content = parallel_analyzer.unit_fob_report()
+            self.assertEqual(expected_report, report_content)
+    
+    def test_parallel_scan_quoted_line_break(self):
+        """Test that a quoted field spanning lines is not split between workers."""
+        quoted_data_file = os.path.join(self.temp_dir.name, "quoted_data.csv")
+        Path(quoted_data_file).write_bytes(
+            CSV_HEADER +
+            b"A101,unit1,unit1 resident,210,11111\n"
+            # The quoted last name spans lines that look like rows of their own
+            b'B102,unit2,"moved from\nC999,fake,x,1,2\nD999,fake,x,3,4",220,22222\n'
+            b"C103,unit3,unit3 resident,230,33333\n"
+        )
+        
+        expected_report = BuildingAccessAnalyzer(quoted_data_file).unit_fob_report()
+        self.assertEqual(tuple(expected_report.splitlines()), (
+            FOB_REPORT_HEADER_LINE,
+            "unit1,210-11111",
+            "unit2,220-22222",
+            "unit3,230-33333",
+        ))
+        for workers in (2, 3):
+            parallel_analyzer = BuildingAccessAnalyzer(quoted_data_file, workers=workers)
+            self.assertEqual(expected_report, parallel_analyzer.unit_fob_report())
+    
     def test_duplicate_fob_ids(self):
         """Test that duplicate fob IDs for the same unit are handled correctly."""
         # Create test data with duplicate fob IDs for the same unit
         duplicate_data_file = os.path.join(self.temp_dir.name, "duplicate_data.csv")
-        with open(duplicate_data_file, 'w', newline='') as file:
-            fieldnames = ["UnitID", "CardFirstName", "CardLastName", "CardBatch", "CardNumber"]
-            writer = csv.DictWriter(file, fieldnames=fieldnames)
-            writer.writeheader()
-            # Write some rows with duplicate fob IDs
-            writer.writerow({
-                "UnitID": "A101", 
-                "CardFirstName": "unit101", 
-                "CardLastName": "unit101 resident", 
-                "CardBatch": "210", 
-                "CardNumber": "54321"
-            })
+        Path(duplicate_data_file).write_bytes(
+            CSV_HEADER +
+            b"A101,unit101,unit101 resident,210,54321\n"
             # Duplicate entry for unit101
-            writer.writerow({
-                "UnitID": "A101", 
-                "CardFirstName": "unit101", 
-                "CardLastName": "unit101 resident", 
-                "CardBatch": "210", 
-                "CardNumber": "54321"
-            })
+            b"A101,unit101,unit101 resident,210,54321\n"
             # Different unit
-            writer.writerow({
-                "UnitID": "B102", 
-                "CardFirstName": "unit102", 
-                "CardLastName": "unit102 resident", 
-                "CardBatch": "220", 
-                "CardNumber": "65432"
-            })
+            b"B102,unit102,unit102 resident,220,65432\n"
+        )
         
         # Initialize analyzer with duplicate data
         duplicate_analyzer = BuildingAccessAnalyzer(duplicate_data_file)
@@ -324,15 +388,30 @@ class TestBuildingAccessAnalyzer(unittest.TestCase):
         report_content = duplicate_analyzer.generate_unit_fob_report(duplicate_output_file)
         
         # Parse the report to check for duplicate handling
-        unit_to_fobs = {}
-        for line in report_content.strip().split('\n')[1:]:  # Skip header
-            unit, fobs_str = line.split(',', 1)
-            fobs = fobs_str.split('; ')
-            unit_to_fobs[unit] = fobs
+        reader = csv.reader(io.StringIO(report_content))
+        next(reader)  # Skip header
+        unit_to_fobs = {row[0]: row[1].split('; ') for row in reader}
         
         # Check that unit101 has only one fob ID (duplicates should be removed)
         self.assertEqual(len(unit_to_fobs["unit101"]), 1)
         self.assertEqual(unit_to_fobs["unit101"][0], "210-54321")
+    
+    def test_unit_with_comma_is_quoted(self):
+        """Test that unit numbers containing commas are quoted in the report."""
+        comma_data_file = os.path.join(self.temp_dir.name, "comma_data.csv")
+        Path(comma_data_file).write_bytes(
+            CSV_HEADER +
+            b'A101,"unit101, annex",unit101 resident,210,54321\n'
+        )
+        
+        comma_analyzer = BuildingAccessAnalyzer(comma_data_file)
+        comma_output_file = os.path.join(self.output_dir, "comma_report.csv")
+        comma_analyzer.generate_unit_fob_report(comma_output_file)
+        
+        # Reading the report back as CSV recovers the original unit number
+        with open(comma_output_file, 'r', newline='') as file:
+            rows = list(csv.reader(file))
+        self.assertEqual(rows[1], ["unit101, annex", "210-54321"])
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file